@@ -35,17 +35,24 @@ import io
 import json
 import logging
 import os
+import random
+import shutil
 import sys
+import tempfile
+import threading
 import time
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Set
 import gzip
 import traceback
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     import yaml
@@ -53,6 +60,26 @@ except ImportError:
     print("ERROR: pyyaml is required. Install with: pip install pyyaml")
     sys.exit(1)
 
+# Optional: orjson parses API responses straight from bytes and serializes
+# request bodies straight to bytes, much faster than the stdlib json module
+# used by requests
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Optional: ISA-L's igzip is a drop-in GzipFile that inflates report
+# downloads several times faster than stdlib zlib
+try:
+    from isal import igzip as gzip_mod
+except ImportError:
+    gzip_mod = gzip
+
 # ============================================================================
 # CONSTANTS
 # ============================================================================
@@ -69,6 +96,34 @@ USER_AGENT = "NWS-PPC-Automation/2.0"
 # Rate limiting
 MAX_REQUESTS_PER_SECOND = 5
 REQUEST_INTERVAL = 1.0 / MAX_REQUESTS_PER_SECOND
+RATE_LIMIT_BURST = MAX_REQUESTS_PER_SECOND  # requests allowed back-to-back after idle time
+
+# Retry backoff: exponential delays tabulated once, plus up to 25% jitter so
+# concurrent callers that hit a 429 together do not retry in lockstep
+MAX_RETRIES = 3
+BASE_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+RETRY_JITTER = 0.25
+RETRY_DELAYS = tuple(min(BASE_RETRY_DELAY * (2 ** i), MAX_RETRY_DELAY)
+                     for i in range(MAX_RETRIES))
+
+# HTTP connection pooling (per host / total connections kept alive)
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+
+# Bulk writes: items per API call and concurrent calls in flight
+BATCH_SIZE = 100
+BATCH_WORKERS = 4
+
+# Report polling: exponential backoff between status checks, +/-20% jitter
+REPORT_POLL_INITIAL = 1.0
+REPORT_POLL_MAX = 60.0
+REPORT_POLL_JITTER = 0.2
+
+# Report downloads: ZIP archives are spooled to disk above this size
+REPORT_SPOOL_MAX = 64 * 1024 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'
 
 # ============================================================================
 # LOGGING SETUP
@@ -89,18 +144,31 @@ logger = logging.getLogger(__name__)
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+# __slots__ drops the per-instance __dict__ on records built once per API
+# row (dataclass slots support needs Python 3.10+)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Auth:
-    """Authentication credentials"""
+    """Authentication credentials
+    
+    ``expires_at`` is wall-clock (epoch seconds) so it stays meaningful if
+    persisted; ``monotonic_deadline`` is the same instant on the monotonic
+    clock and is preferred in-process because it ignores NTP adjustments.
+    """
     access_token: str
     token_type: str
     expires_at: float
+    monotonic_deadline: Optional[float] = None
 
     def is_expired(self) -> bool:
+        if self.monotonic_deadline is not None:
+            return time.monotonic() > self.monotonic_deadline - 60
         return time.time() > self.expires_at - 60
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Campaign:
     """Campaign data structure"""
     campaign_id: str
@@ -111,7 +179,7 @@ class Campaign:
     campaign_type: str = "sponsoredProducts"
     
     
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AdGroup:
     """Ad Group data structure"""
     ad_group_id: str
@@ -121,7 +189,7 @@ class AdGroup:
     default_bid: float
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Keyword:
     """Keyword data structure"""
     keyword_id: str
@@ -133,43 +201,88 @@ class Keyword:
     bid: float
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceMetrics:
-    """Performance metrics for keywords/campaigns"""
+    """Performance metrics for keywords/campaigns
+    
+    Derived ratios are computed once at construction; instances are built
+    from a report row and not modified afterwards.
+    """
     impressions: int = 0
     clicks: int = 0
     cost: float = 0.0
     sales: float = 0.0
     orders: int = 0
+    ctr: float = field(init=False, default=0.0)
+    acos: float = field(init=False, default=0.0)
+    roas: float = field(init=False, default=0.0)
+    cpc: float = field(init=False, default=0.0)
     
-    @property
-    def ctr(self) -> float:
-        return (self.clicks / self.impressions) if self.impressions > 0 else 0.0
-    
-    @property
-    def acos(self) -> float:
-        return (self.cost / self.sales) if self.sales > 0 else float('inf')
-    
-    @property
-    def roas(self) -> float:
-        return (self.sales / self.cost) if self.cost > 0 else 0.0
+    def __post_init__(self):
+        self.ctr = (self.clicks / self.impressions) if self.impressions > 0 else 0.0
+        self.acos = (self.cost / self.sales) if self.sales > 0 else float('inf')
+        self.roas = (self.sales / self.cost) if self.cost > 0 else 0.0
+        self.cpc = (self.cost / self.clicks) if self.clicks > 0 else 0.0
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class BidThresholds:
+    """Bid optimization thresholds, read from config once per run"""
+    min_clicks: int
+    min_spend: float
+    target_acos: float
+    high_acos: float
+    low_acos: float
+    up_pct: float
+    down_pct: float
+    min_bid: float
+    max_bid: float
     
-    @property
-    def cpc(self) -> float:
-        return (self.cost / self.clicks) if self.clicks > 0 else 0.0
+    @classmethod
+    def from_config(cls, config: 'Config') -> 'BidThresholds':
+        # Coerce so integer config values (e.g. max_bid: 5) still yield float
+        # bids, which the audit trail formats as dollar amounts
+        return cls(
+            min_clicks=int(config.get('bid_optimization.min_clicks', 25)),
+            min_spend=float(config.get('bid_optimization.min_spend', 5.0)),
+            target_acos=float(config.get('bid_optimization.target_acos', 0.45)),
+            high_acos=float(config.get('bid_optimization.high_acos', 0.60)),
+            low_acos=float(config.get('bid_optimization.low_acos', 0.25)),
+            up_pct=float(config.get('bid_optimization.up_pct', 0.15)),
+            down_pct=float(config.get('bid_optimization.down_pct', 0.20)),
+            min_bid=float(config.get('bid_optimization.min_bid', 0.25)),
+            max_bid=float(config.get('bid_optimization.max_bid', 5.0)),
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AuditEntry:
-    """Audit trail entry"""
+    """Audit trail entry
+
+    Values and reason arguments are stored raw; formatting into the
+    human-readable CSV strings happens once, when AuditLogger writes the row.
+    """
     timestamp: str
     action_type: str
     entity_type: str
     entity_id: str
-    old_value: str
-    new_value: str
+    old_value: Any
+    new_value: Any
     reason: str
     dry_run: bool
+    reason_args: Tuple = ()
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class SearchTerm:
+    """One decoded row of the search-term report"""
+    query: str
+    campaign_id: Optional[str]
+    ad_group_id: Optional[str]
+    clicks: int
+    cost: float
+    sales: float
+    acos: float
 
 
 # ============================================================================
@@ -177,23 +290,48 @@ class AuditEntry:
 # ============================================================================
 
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Thread-safe token-bucket rate limiter for API calls
     
-    def __init__(self, max_per_second: int = MAX_REQUESTS_PER_SECOND):
+    Tokens refill continuously at max_per_second up to a bucket of ``burst``,
+    so time spent waiting on slow responses is credited to later requests.
+    The bucket is tracked as a single integer (GCRA): the monotonic time (ns)
+    at which it would be full again. Callers reserve tokens under the lock
+    and sleep outside it, so concurrent threads never share or lose a token.
+    """
+    
+    def __init__(self, max_per_second: int = MAX_REQUESTS_PER_SECOND,
+                 burst: int = RATE_LIMIT_BURST):
         self.max_per_second = max_per_second
+        self.burst = burst
         self.interval = 1.0 / max_per_second
-        self.last_request_time = 0.0
+        self._interval_ns = int(1_000_000_000 / max_per_second)
+        self._burst_ns = burst * self._interval_ns
+        self._full_at_ns = 0
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens if they are available now, without waiting"""
+        with self._lock:
+            now = time.monotonic_ns()
+            full_at = max(now, self._full_at_ns) + tokens * self._interval_ns
+            if full_at - self._burst_ns > now:
+                return False
+            self._full_at_ns = full_at
+            return True
+    
+    def acquire(self, tokens: int = 1):
+        """Take tokens, sleeping until they have refilled if necessary"""
+        with self._lock:
+            now = time.monotonic_ns()
+            self._full_at_ns = max(now, self._full_at_ns) + tokens * self._interval_ns
+            ready = self._full_at_ns - self._burst_ns
+        
+        if ready > now:
+            time.sleep((ready - now) / 1_000_000_000)
     
     def wait_if_needed(self):
         """Wait if necessary to respect rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.interval:
-            sleep_time = self.interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.acquire()
 
 
 # ============================================================================
@@ -206,6 +344,8 @@ class Config:
     def __init__(self, config_path: str):
         self.config_path = config_path
         self.data = self._load_config()
+        # Dotted-path lookup table; self.data is never mutated after load
+        self._flat = self._flatten(self.data)
     
     def _load_config(self) -> Dict:
         """Load configuration from YAML file"""
@@ -218,19 +358,22 @@ class Config:
             logger.error(f"Failed to load configuration: {e}")
             sys.exit(1)
     
+    @staticmethod
+    def _flatten(data, prefix: str = '') -> Dict[str, Any]:
+        """Map every dotted key path (including nested sections) to its value"""
+        flat = {}
+        if isinstance(data, dict):
+            for k, v in data.items():
+                if not isinstance(k, str):
+                    continue
+                path = f"{prefix}{k}"
+                flat[path] = v
+                flat.update(Config._flatten(v, f"{path}."))
+        return flat
+    
     def get(self, key: str, default=None):
         """Get configuration value with dot notation support"""
-        keys = key.split('.')
-        value = self.data
-        
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-        
+        value = self._flat.get(key)
         return value if value is not None else default
 
 
@@ -239,7 +382,16 @@ class Config:
 # ============================================================================
 
 class AuditLogger:
-    """CSV-based audit trail logger"""
+    """CSV-based audit trail logger
+    
+    Entries are written to disk as they are logged (flushed every
+    FLUSH_EVERY rows) so memory stays flat and the trail survives a crash.
+    """
+    
+    # Column order matches the AuditEntry field order
+    FIELDNAMES = ('timestamp', 'action_type', 'entity_type', 'entity_id',
+                  'old_value', 'new_value', 'reason', 'dry_run')
+    FLUSH_EVERY = 100
     
     def __init__(self, output_dir: str = "."):
         self.output_dir = output_dir
@@ -247,11 +399,18 @@ class AuditLogger:
             output_dir,
             f"ppc_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         )
-        self.entries: List[AuditEntry] = []
+        self.entry_count = 0
+        self._file = None
+        self._writer = None
     
     def log(self, action_type: str, entity_type: str, entity_id: str,
-            old_value: str, new_value: str, reason: str, dry_run: bool = False):
-        """Log an audit entry"""
+            old_value: Any, new_value: Any, reason: str, dry_run: bool = False,
+            reason_args: Tuple = ()):
+        """Log an audit entry
+
+        Float values are written as dollar amounts and ``reason`` is treated
+        as a ``str.format`` template for ``reason_args``.
+        """
         entry = AuditEntry(
             timestamp=datetime.utcnow().isoformat(),
             action_type=action_type,
@@ -260,36 +419,77 @@ class AuditLogger:
             old_value=old_value,
             new_value=new_value,
             reason=reason,
-            dry_run=dry_run
+            dry_run=dry_run,
+            reason_args=reason_args
         )
-        self.entries.append(entry)
+        
+        try:
+            if self._writer is None:
+                self._open()
+            self._writer.writerow(self._format_row(entry))
+            self.entry_count += 1
+            if self.entry_count % self.FLUSH_EVERY == 0:
+                self._file.flush()
+        except Exception as e:
+            logger.error(f"Failed to write audit entry: {e}")
+    
+    def log_many(self, entries: List[Tuple]):
+        """Log several audit entries with a single write and flush
+        
+        Each entry is a tuple of log() arguments: (action_type, entity_type,
+        entity_id, old_value, new_value, reason, dry_run[, reason_args]).
+        All entries share one timestamp.
+        """
+        if not entries:
+            return
+        
+        timestamp = datetime.utcnow().isoformat()
+        try:
+            rows = [self._format_row(AuditEntry(timestamp, *entry)) for entry in entries]
+            if self._writer is None:
+                self._open()
+            self._writer.writerows(rows)
+            self.entry_count += len(rows)
+            self._file.flush()
+        except Exception as e:
+            logger.error(f"Failed to write audit entries: {e}")
+    
+    def _open(self):
+        """Open the CSV file, writing the header on first use"""
+        new_file = self.entry_count == 0
+        self._file = open(self.filename, 'w' if new_file else 'a',
+                          newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if new_file:
+            self._writer.writerow(self.FIELDNAMES)
+    
+    @staticmethod
+    def _format_value(value: Any) -> Any:
+        """Format raw audit values (floats are bid/budget amounts)"""
+        return f"${value:.2f}" if isinstance(value, float) else value
+    
+    def _format_row(self, entry: AuditEntry) -> Tuple:
+        """Render an entry as a CSV row in FIELDNAMES order"""
+        reason = entry.reason
+        if entry.reason_args:
+            reason = reason.format(*entry.reason_args)
+        return (entry.timestamp, entry.action_type, entry.entity_type,
+                entry.entity_id, self._format_value(entry.old_value),
+                self._format_value(entry.new_value), reason, entry.dry_run)
     
     def save(self):
-        """Save audit trail to CSV"""
-        if not self.entries:
+        """Flush and close the audit trail CSV"""
+        if not self.entry_count:
             logger.info("No audit entries to save")
             return
         
         try:
-            with open(self.filename, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['timestamp', 'action_type', 'entity_type', 'entity_id',
-                             'old_value', 'new_value', 'reason', 'dry_run']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for entry in self.entries:
-                    writer.writerow({
-                        'timestamp': entry.timestamp,
-                        'action_type': entry.action_type,
-                        'entity_type': entry.entity_type,
-                        'entity_id': entry.entity_id,
-                        'old_value': entry.old_value,
-                        'new_value': entry.new_value,
-                        'reason': entry.reason,
-                        'dry_run': entry.dry_run
-                    })
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._writer = None
             
-            logger.info(f"Audit trail saved to {self.filename} ({len(self.entries)} entries)")
+            logger.info(f"Audit trail saved to {self.filename} ({self.entry_count} entries)")
         except Exception as e:
             logger.error(f"Failed to save audit trail: {e}")
 
@@ -305,9 +505,30 @@ class AmazonAdsAPI:
         self.profile_id = profile_id
         self.region = region.upper()
         self.base_url = ENDPOINTS.get(self.region, ENDPOINTS["NA"])
-        self.auth = self._authenticate()
+        self.session = self._create_session()
+        # Static per-profile headers, built once; only Authorization changes
+        self._header_template = {
+            "Content-Type": "application/json",
+            "Amazon-Advertising-API-ClientId": os.getenv("AMAZON_CLIENT_ID"),
+            "Amazon-Advertising-API-Scope": profile_id,
+        }
+        self._auth_lock = threading.Lock()
+        self._set_auth(self._authenticate())
         self.rate_limiter = RateLimiter()
     
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session so TCP/TLS connections are reused"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                              pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount('https://', adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        return session
+    
     def _authenticate(self) -> Auth:
         """Authenticate and get access token"""
         client_id = os.getenv("AMAZON_CLIENT_ID")
@@ -326,14 +547,16 @@ class AmazonAdsAPI:
         }
         
         try:
-            response = requests.post(TOKEN_URL, data=payload, timeout=30)
+            response = self.session.post(TOKEN_URL, data=payload, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
+            expires_in = int(data.get("expires_in", 3600))
             
             auth = Auth(
                 access_token=data["access_token"],
                 token_type=data.get("token_type", "Bearer"),
-                expires_at=time.time() + int(data.get("expires_in", 3600))
+                expires_at=time.time() + expires_in,
+                monotonic_deadline=time.monotonic() + expires_in
             )
             logger.info("Successfully authenticated with Amazon Ads API")
             return auth
@@ -341,41 +564,53 @@ class AmazonAdsAPI:
             logger.error(f"Authentication failed: {e}")
             sys.exit(1)
     
+    def _set_auth(self, auth: Auth):
+        """Store credentials and rebuild the cached request headers"""
+        self.auth = auth
+        self._auth_headers = MappingProxyType({
+            **self._header_template,
+            "Authorization": f"{auth.token_type} {auth.access_token}",
+        })
+    
     def _refresh_auth_if_needed(self):
         """Refresh authentication if token expired"""
         if self.auth.is_expired():
-            logger.info("Access token expired, refreshing...")
-            self.auth = self._authenticate()
+            # Concurrent callers share a single refresh
+            with self._auth_lock:
+                if self.auth.is_expired():
+                    logger.info("Access token expired, refreshing...")
+                    try:
+                        auth = self._authenticate()
+                    except SystemExit:
+                        # _authenticate exits on failure, which suits startup
+                        # but would kill a long-lived caller (e.g. a server
+                        # worker); fail just this request instead
+                        raise RuntimeError("Access token refresh failed") from None
+                    self._set_auth(auth)
     
-    def _headers(self) -> Dict[str, str]:
-        """Get API request headers"""
+    def _headers(self) -> MappingProxyType:
+        """Get API request headers (read-only; rebuilt only on token refresh)"""
         self._refresh_auth_if_needed()
-        
-        return {
-            "Authorization": f"{self.auth.token_type} {self.auth.access_token}",
-            "Content-Type": "application/json",
-            "Amazon-Advertising-API-ClientId": os.getenv("AMAZON_CLIENT_ID"),
-            "Amazon-Advertising-API-Scope": self.profile_id,
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
-        }
+        return self._auth_headers
     
     def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make API request with retry logic and rate limiting"""
-        self.rate_limiter.wait_if_needed()
+        self.rate_limiter.acquire()
         
         url = f"{self.base_url}{endpoint}"
-        max_retries = 3
-        retry_delay = 1
         
         # Merge any additional headers with base headers
         headers = self._headers()
         if 'headers' in kwargs:
-            headers.update(kwargs.pop('headers'))
+            headers = {**headers, **kwargs.pop('headers')}
         
-        for attempt in range(max_retries):
+        # Serialize the body once, up front, rather than on every retry
+        if 'json' in kwargs:
+            kwargs['data'] = json_dumps(kwargs.pop('json'))
+        
+        for attempt in range(MAX_RETRIES):
             try:
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     headers=headers,
@@ -384,23 +619,45 @@ class AmazonAdsAPI:
                 )
                 
                 if response.status_code == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', retry_delay * (attempt + 1)))
-                    logger.warning(f"Rate limit hit, waiting {retry_after}s...")
-                    time.sleep(retry_after)
+                    # Honor the server's Retry-After exactly; jitter only our own backoff
+                    retry_after = response.headers.get('Retry-After')
+                    wait = int(retry_after) if retry_after else self._retry_delay(attempt)
+                    logger.warning(f"Rate limit hit, waiting {wait:.1f}s...")
+                    time.sleep(wait)
                     continue
                 
                 response.raise_for_status()
                 return response
                 
             except requests.exceptions.HTTPError as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Request failed after {max_retries} attempts: {e}")
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"Request failed after {MAX_RETRIES} attempts: {e}")
                     raise
-                logger.warning(f"Request failed (attempt {attempt + 1}/{max_retries}): {e}")
-                time.sleep(retry_delay * (attempt + 1))
+                logger.warning(f"Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                time.sleep(self._retry_delay(attempt))
         
         raise Exception("Max retries exceeded")
     
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Backoff delay for a retry attempt, with random jitter"""
+        base = RETRY_DELAYS[attempt]
+        return base + random.uniform(0, base * RETRY_JITTER)
+    
+    def _run_batches(self, func, items: List, batch_size: int = BATCH_SIZE) -> List:
+        """Apply func to batch_size slices of items, several batches in flight
+        
+        Pacing is left to the shared rate limiter inside _request; the pool
+        only overlaps network round-trips. Results are in batch order.
+        """
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        if len(batches) <= 1:
+            return [func(batch) for batch in batches]
+        
+        workers = min(BATCH_WORKERS, HTTP_POOL_MAXSIZE, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, batches))
+    
     # ========================================================================
     # CAMPAIGNS
     # ========================================================================
@@ -420,7 +677,7 @@ class AmazonAdsAPI:
                 payload['stateFilter'] = {'include': [state_filter] if isinstance(state_filter, str) else state_filter}
             
             response = self._request('POST', '/sp/campaigns/list', json=payload, headers=headers)
-            result = response.json()
+            result = json_loads(response.content)
             campaigns_data = result.get('campaigns', [])
             
             campaigns = []
@@ -464,7 +721,7 @@ class AmazonAdsAPI:
         """Create new campaign"""
         try:
             response = self._request('POST', '/v2/sp/campaigns', json=[campaign_data])
-            result = response.json()
+            result = json_loads(response.content)
             
             if result and len(result) > 0:
                 campaign_id = result[0].get('campaignId')
@@ -487,7 +744,7 @@ class AmazonAdsAPI:
                 params['campaignIdFilter'] = campaign_id
             
             response = self._request('GET', '/v2/sp/adGroups', params=params)
-            ad_groups_data = response.json()
+            ad_groups_data = json_loads(response.content)
             
             ad_groups = []
             for ag in ad_groups_data:
@@ -506,11 +763,28 @@ class AmazonAdsAPI:
             logger.error(f"Failed to get ad groups: {e}")
             return []
     
+    def get_ad_groups_bulk(self, campaign_ids: List[str], max_workers: int = 4) -> List[AdGroup]:
+        """Get ad groups for several campaigns concurrently
+        
+        Requests overlap their network round-trips while the shared rate
+        limiter still paces when each one is sent. Workers are capped at the
+        limiter's burst (threads beyond it would only queue in acquire())
+        and the connection pool size. Results keep the order of campaign_ids.
+        """
+        if not campaign_ids:
+            return []
+        
+        workers = max(1, min(max_workers, self.rate_limiter.burst,
+                             HTTP_POOL_MAXSIZE, len(campaign_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda cid: self.get_ad_groups(campaign_id=cid), campaign_ids)
+            return [ad_group for ad_groups in results for ad_group in ad_groups]
+    
     def create_ad_group(self, ad_group_data: Dict) -> Optional[str]:
         """Create new ad group"""
         try:
             response = self._request('POST', '/v2/sp/adGroups', json=[ad_group_data])
-            result = response.json()
+            result = json_loads(response.content)
             
             if result and len(result) > 0:
                 ad_group_id = result[0].get('adGroupId')
@@ -542,7 +816,7 @@ class AmazonAdsAPI:
                 payload['adGroupIdFilter'] = {'include': [ad_group_id] if isinstance(ad_group_id, str) else ad_group_id}
             
             response = self._request('POST', '/sp/keywords/list', json=payload, headers=headers)
-            result = response.json()
+            result = json_loads(response.content)
             keywords_data = result.get('keywords', [])
             
             keywords = []
@@ -581,24 +855,63 @@ class AmazonAdsAPI:
                 updates['state'] = state
             
             response = self._request('PUT', '/sp/keywords', json={'keywords': [updates]}, headers=headers)
-            logger.debug(f"Updated keyword {keyword_id} bid to ${bid:.2f}")
+            logger.debug("Updated keyword %s bid to $%.2f", keyword_id, bid)
             return True
         except Exception as e:
             logger.error(f"Failed to update keyword {keyword_id}: {e}")
             return False
     
+    def update_keywords_batch(self, updates: List[Dict]) -> int:
+        """Update keyword bids/states in batches
+        
+        Each update is a dict with 'keywordId', 'bid' and optional 'state'.
+        Returns the number of keywords in batches that were accepted.
+        """
+        updated = sum(self._run_batches(self._update_keywords_chunk, updates))
+        logger.info(f"Updated {updated} of {len(updates)} keywords")
+        return updated
+    
+    def _update_keywords_chunk(self, batch: List[Dict]) -> int:
+        """Send one batch of keyword updates"""
+        try:
+            headers = {
+                'Accept': 'application/vnd.spKeyword.v3+json',
+                'Content-Type': 'application/vnd.spKeyword.v3+json'
+            }
+            
+            payload = []
+            for update in batch:
+                item = {
+                    'keywordId': int(update['keywordId']),
+                    'bid': round(update['bid'], 2)
+                }
+                if update.get('state'):
+                    item['state'] = update['state']
+                payload.append(item)
+            
+            self._request('PUT', '/sp/keywords', json={'keywords': payload}, headers=headers)
+            return len(payload)
+        except Exception as e:
+            logger.error(f"Failed to update keyword batch: {e}")
+            return 0
+    
     def create_keywords(self, keywords_data: List[Dict]) -> List[str]:
-        """Create new keywords"""
+        """Create new keywords (batched)"""
+        created_ids = [kid for ids in self._run_batches(self._create_keywords_chunk, keywords_data)
+                       for kid in ids]
+        logger.info(f"Created {len(created_ids)} keywords")
+        return created_ids
+    
+    def _create_keywords_chunk(self, batch: List[Dict]) -> List[str]:
+        """Create one batch of keywords"""
         try:
-            response = self._request('POST', '/v2/sp/keywords', json=keywords_data)
-            result = response.json()
+            response = self._request('POST', '/v2/sp/keywords', json=batch)
+            result = json_loads(response.content)
             
             created_ids = []
             for r in result:
                 if r.get('code') == 'SUCCESS':
                     created_ids.append(str(r.get('keywordId')))
-            
-            logger.info(f"Created {len(created_ids)} keywords")
             return created_ids
         except Exception as e:
             logger.error(f"Failed to create keywords: {e}")
@@ -616,23 +929,29 @@ class AmazonAdsAPI:
                 params['campaignIdFilter'] = campaign_id
             
             response = self._request('GET', '/v2/sp/negativeKeywords', params=params)
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
             logger.error(f"Failed to get negative keywords: {e}")
             return []
     
     def create_negative_keywords(self, negative_keywords_data: List[Dict]) -> List[str]:
-        """Create negative keywords"""
+        """Create negative keywords (batched)"""
+        created_ids = [kid for ids in self._run_batches(self._create_negative_keywords_chunk,
+                                                        negative_keywords_data)
+                       for kid in ids]
+        logger.info(f"Created {len(created_ids)} negative keywords")
+        return created_ids
+    
+    def _create_negative_keywords_chunk(self, batch: List[Dict]) -> List[str]:
+        """Create one batch of negative keywords"""
         try:
-            response = self._request('POST', '/v2/sp/negativeKeywords', json=negative_keywords_data)
-            result = response.json()
+            response = self._request('POST', '/v2/sp/negativeKeywords', json=batch)
+            result = json_loads(response.content)
             
             created_ids = []
             for r in result:
                 if r.get('code') == 'SUCCESS':
                     created_ids.append(str(r.get('keywordId')))
-            
-            logger.info(f"Created {len(created_ids)} negative keywords")
             return created_ids
         except Exception as e:
             logger.error(f"Failed to create negative keywords: {e}")
@@ -662,7 +981,7 @@ class AmazonAdsAPI:
             
             endpoint = f'/v2/sp/{report_type}/report'
             response = self._request('POST', endpoint, json=payload)
-            report_id = response.json().get('reportId')
+            report_id = json_loads(response.content).get('reportId')
             
             logger.info(f"Created report {report_id} (type: {report_type})")
             return report_id
@@ -674,46 +993,60 @@ class AmazonAdsAPI:
         """Get report status"""
         try:
             response = self._request('GET', f'/v2/reports/{report_id}')
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
             logger.error(f"Failed to get report status: {e}")
             return {}
     
     def download_report(self, report_url: str) -> List[Dict]:
-        """Download and parse report"""
+        """Download and parse report
+        
+        The body is streamed and decompressed incrementally; the format
+        (gzip, zip or plain CSV) is detected from its leading magic bytes.
+        """
         try:
-            response = requests.get(report_url, timeout=60)
-            response.raise_for_status()
-            
-            # Try to decompress as gzip or zip
-            content = response.content
-            
-            try:
-                # Try ZIP format first
-                with zipfile.ZipFile(io.BytesIO(content)) as z:
+            with self.session.get(report_url, stream=True, timeout=120) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return self._parse_report_stream(io.BufferedReader(response.raw))
+        except Exception as e:
+            logger.error(f"Failed to download report: {e}")
+            return []
+    
+    @staticmethod
+    def _parse_report_stream(stream: io.BufferedReader) -> List[Dict]:
+        """Parse a CSV report from a (possibly compressed) binary stream"""
+        magic = stream.peek(4)[:4]
+        
+        if magic.startswith(GZIP_MAGIC):
+            with gzip_mod.GzipFile(fileobj=stream) as gz:
+                text = io.TextIOWrapper(gz, encoding='utf-8', newline='')
+                return list(csv.DictReader(text))
+        
+        if magic == ZIP_MAGIC:
+            # ZipFile needs a seekable file; small archives stay in memory
+            with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX) as spool:
+                shutil.copyfileobj(stream, spool)
+                spool.seek(0)
+                with zipfile.ZipFile(spool) as z:
                     names = z.namelist()
                     with z.open(names[0]) as f:
                         text = io.TextIOWrapper(f, encoding='utf-8', newline='')
                         return list(csv.DictReader(text))
-            except zipfile.BadZipFile:
-                # Try GZIP format
-                try:
-                    with gzip.GzipFile(fileobj=io.BytesIO(content)) as gz:
-                        text = io.TextIOWrapper(gz, encoding='utf-8', newline='')
-                        return list(csv.DictReader(text))
-                except Exception:
-                    # Try as plain text
-                    text = io.StringIO(content.decode('utf-8'))
-                    return list(csv.DictReader(text))
-        except Exception as e:
-            logger.error(f"Failed to download report: {e}")
-            return []
+        
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        return list(csv.DictReader(text))
     
     def wait_for_report(self, report_id: str, timeout: int = 300) -> Optional[str]:
-        """Wait for report to be ready and return download URL"""
-        start_time = time.time()
+        """Wait for report to be ready and return download URL
+        
+        Polls with exponential backoff (1s doubling to 60s, jittered), seeded
+        from the report's estimatedCompletionTime when the API provides one.
+        """
+        start_time = time.monotonic()
+        wait = None
         
-        while time.time() - start_time < timeout:
+        while True:
             status_data = self.get_report_status(report_id)
             status = status_data.get('status')
             
@@ -723,11 +1056,58 @@ class AmazonAdsAPI:
                 logger.error(f"Report {report_id} failed: {status}")
                 return None
             
-            time.sleep(5)
+            if wait is None:
+                wait = self._report_eta(status_data) or REPORT_POLL_INITIAL
+            else:
+                wait = wait * 2
+            wait = min(wait, REPORT_POLL_MAX)
+            
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            jitter = random.uniform(1 - REPORT_POLL_JITTER, 1 + REPORT_POLL_JITTER)
+            time.sleep(min(wait * jitter, remaining))
         
         logger.error(f"Report {report_id} timeout")
         return None
     
+    @staticmethod
+    def _report_eta(status_data: Dict) -> Optional[float]:
+        """Seconds until estimatedCompletionTime, if the status carries one"""
+        eta = status_data.get('estimatedCompletionTime')
+        if eta is None:
+            return None
+        try:
+            if isinstance(eta, (int, float)):
+                seconds = float(eta)
+            else:
+                completion = datetime.fromisoformat(str(eta).replace('Z', '+00:00'))
+                seconds = (completion - datetime.now(completion.tzinfo)).total_seconds()
+        except ValueError:
+            return None
+        return seconds if seconds > 0 else None
+    
+    def get_report_data(self, report_type: str, metrics: List[str],
+                        report_date: str = None, segment: str = None) -> Optional[List[Dict]]:
+        """Create a report, wait for it and return its rows
+        
+        Returns None if the report could not be produced. patch_api_client()
+        in amazon_ppc_optimizer_v2 replaces this with a v3 version that can
+        reuse rows cached by earlier runs.
+        """
+        report_id = self.create_report(report_type, metrics,
+                                       report_date=report_date, segment=segment)
+        if not report_id:
+            logger.error(f"Failed to create {report_type} report")
+            return None
+        
+        report_url = self.wait_for_report(report_id)
+        if not report_url:
+            logger.error(f"Failed to get {report_type} report data")
+            return None
+        
+        return self.download_report(report_url)
+    
     # ========================================================================
     # KEYWORD SUGGESTIONS
     # ========================================================================
@@ -742,7 +1122,7 @@ class AmazonAdsAPI:
             }
             
             response = self._request('POST', '/v2/sp/targets/keywords/recommendations', json=payload)
-            recommendations = response.json()
+            recommendations = json_loads(response.content)
             
             suggested_keywords = []
             if 'recommendations' in recommendations:
@@ -785,36 +1165,30 @@ class BidOptimizer:
         
         # Get performance data
         lookback_days = self.config.get('bid_optimization.lookback_days', 14)
-        report_id = self.api.create_report(
+        report_data = self.api.get_report_data(
             'keywords',
             ['campaignId', 'adGroupId', 'keywordId', 'impressions', 'clicks', 
              'cost', 'attributedSales14d', 'attributedConversions14d'],
             report_date=(datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
         )
-        
-        if not report_id:
-            logger.error("Failed to create performance report")
+        if report_data is None:
             return results
         
-        report_url = self.api.wait_for_report(report_id)
-        if not report_url:
-            logger.error("Failed to get report data")
-            return results
-        
-        report_data = self.api.download_report(report_url)
-        
         # Get current keywords
         keywords = self.api.get_keywords()
         keyword_map = {kw.keyword_id: kw for kw in keywords}
+        thresholds = BidThresholds.from_config(self.config)
+        audit_rows = []
+        bid_updates = []
         
         # Analyze each keyword
         for row in report_data:
             keyword_id = row.get('keywordId')
-            if not keyword_id or keyword_id not in keyword_map:
+            keyword = keyword_map.get(keyword_id)
+            if keyword is None:
                 continue
             
             results['keywords_analyzed'] += 1
-            keyword = keyword_map[keyword_id]
             
             # Calculate metrics
             metrics = PerformanceMetrics(
@@ -826,82 +1200,71 @@ class BidOptimizer:
             )
             
             # Determine bid change
-            new_bid = self._calculate_new_bid(keyword, metrics)
+            new_bid = self._calculate_new_bid(keyword, metrics, thresholds)
             
             if new_bid and abs(new_bid - keyword.bid) > 0.01:
-                reason = self._get_bid_change_reason(keyword, metrics, new_bid)
+                reason, reason_args = self._get_bid_change_reason(keyword, metrics, new_bid,
+                                                                  thresholds)
                 
                 if new_bid > keyword.bid:
                     results['bids_increased'] += 1
                 else:
                     results['bids_decreased'] += 1
                 
-                self.audit.log(
-                    'BID_UPDATE',
-                    'KEYWORD',
-                    keyword_id,
-                    f"${keyword.bid:.2f}",
-                    f"${new_bid:.2f}",
-                    reason,
-                    dry_run
-                )
+                audit_rows.append(('BID_UPDATE', 'KEYWORD', keyword_id, keyword.bid,
+                                   new_bid, reason, dry_run, reason_args))
                 
                 if not dry_run:
-                    self.api.update_keyword_bid(keyword_id, new_bid)
+                    bid_updates.append({'keywordId': keyword_id, 'bid': new_bid})
             else:
                 results['no_change'] += 1
         
+        self.audit.log_many(audit_rows)
+        
+        if bid_updates:
+            self.api.update_keywords_batch(bid_updates)
+        
         logger.info(f"Bid optimization complete: {results}")
         return results
     
-    def _calculate_new_bid(self, keyword: Keyword, metrics: PerformanceMetrics) -> Optional[float]:
+    def _calculate_new_bid(self, keyword: Keyword, metrics: PerformanceMetrics,
+                           t: BidThresholds) -> Optional[float]:
         """Calculate new bid based on performance"""
-        # Get thresholds from config
-        min_clicks = self.config.get('bid_optimization.min_clicks', 25)
-        min_spend = self.config.get('bid_optimization.min_spend', 5.0)
-        target_acos = self.config.get('bid_optimization.target_acos', 0.45)
-        high_acos = self.config.get('bid_optimization.high_acos', 0.60)
-        low_acos = self.config.get('bid_optimization.low_acos', 0.25)
-        up_pct = self.config.get('bid_optimization.up_pct', 0.15)
-        down_pct = self.config.get('bid_optimization.down_pct', 0.20)
-        min_bid = self.config.get('bid_optimization.min_bid', 0.25)
-        max_bid = self.config.get('bid_optimization.max_bid', 5.0)
-        
         # Check if we have enough data
-        if metrics.clicks < min_clicks and metrics.cost < min_spend:
+        if metrics.clicks < t.min_clicks and metrics.cost < t.min_spend:
             return None
         
         current_bid = keyword.bid
         
         # No sales - reduce bid
-        if metrics.sales <= 0 and metrics.clicks >= min_clicks:
-            new_bid = current_bid * (1 - down_pct)
+        if metrics.sales <= 0 and metrics.clicks >= t.min_clicks:
+            new_bid = current_bid * (1 - t.down_pct)
         # High ACOS - reduce bid
-        elif metrics.acos > high_acos:
-            new_bid = current_bid * (1 - down_pct)
+        elif metrics.acos > t.high_acos:
+            new_bid = current_bid * (1 - t.down_pct)
         # Low ACOS - increase bid
-        elif metrics.acos < low_acos and metrics.sales > 0:
-            new_bid = current_bid * (1 + up_pct)
+        elif metrics.acos < t.low_acos and metrics.sales > 0:
+            new_bid = current_bid * (1 + t.up_pct)
         # Medium ACOS - no change
         else:
             return None
         
         # Clamp to min/max
-        new_bid = max(min_bid, min(max_bid, new_bid))
+        new_bid = max(t.min_bid, min(t.max_bid, new_bid))
         
         return round(new_bid, 2)
     
     def _get_bid_change_reason(self, keyword: Keyword, metrics: PerformanceMetrics, 
-                               new_bid: float) -> str:
-        """Get reason for bid change"""
+                               new_bid: float, t: BidThresholds) -> Tuple[str, Tuple]:
+        """Get reason template and arguments for bid change"""
         if metrics.sales <= 0:
-            return f"No sales after {metrics.clicks} clicks"
-        elif metrics.acos > self.config.get('bid_optimization.high_acos', 0.60):
-            return f"High ACOS ({metrics.acos:.1%}) - reducing bid"
-        elif metrics.acos < self.config.get('bid_optimization.low_acos', 0.25):
-            return f"Low ACOS ({metrics.acos:.1%}) - increasing bid"
+            return "No sales after {} clicks", (metrics.clicks,)
+        elif metrics.acos > t.high_acos:
+            return "High ACOS ({:.1%}) - reducing bid", (metrics.acos,)
+        elif metrics.acos < t.low_acos:
+            return "Low ACOS ({:.1%}) - increasing bid", (metrics.acos,)
         else:
-            return f"ACOS: {metrics.acos:.1%}, CTR: {metrics.ctr:.2%}"
+            return "ACOS: {:.1%}, CTR: {:.2%}", (metrics.acos, metrics.ctr)
 
 
 class DaypartingManager:
@@ -939,6 +1302,11 @@ class DaypartingManager:
         
         # Get all keywords
         keywords = self.api.get_keywords()
+        bid_updates = []
+        
+        # Bid caps; floats so capped bids are audited as dollar amounts
+        min_bid = float(self.config.get('bid_optimization.min_bid', 0.25))
+        max_bid = float(self.config.get('bid_optimization.max_bid', 5.0))
         
         for keyword in keywords:
             # Store base bid if not stored
@@ -949,8 +1317,6 @@ class DaypartingManager:
             new_bid = base_bid * multiplier
             
             # Apply bid caps
-            min_bid = self.config.get('bid_optimization.min_bid', 0.25)
-            max_bid = self.config.get('bid_optimization.max_bid', 5.0)
             new_bid = max(min_bid, min(max_bid, new_bid))
             new_bid = round(new_bid, 2)
             
@@ -959,17 +1325,21 @@ class DaypartingManager:
                     'DAYPARTING_ADJUSTMENT',
                     'KEYWORD',
                     keyword.keyword_id,
-                    f"${keyword.bid:.2f}",
-                    f"${new_bid:.2f}",
-                    f"Dayparting: {current_day} {current_hour}:00 ({multiplier:.2f}x)",
-                    dry_run
+                    keyword.bid,
+                    new_bid,
+                    "Dayparting: {} {}:00 ({:.2f}x)",
+                    dry_run,
+                    reason_args=(current_day, current_hour, multiplier)
                 )
                 
                 if not dry_run:
-                    self.api.update_keyword_bid(keyword.keyword_id, new_bid)
+                    bid_updates.append({'keywordId': keyword.keyword_id, 'bid': new_bid})
                 
                 results['keywords_updated'] += 1
         
+        if bid_updates:
+            self.api.update_keywords_batch(bid_updates)
+        
         logger.info(f"Dayparting applied: {results}")
         return results
     
@@ -1012,22 +1382,14 @@ class CampaignManager:
         }
         
         # Get performance data
-        report_id = self.api.create_report(
+        report_data = self.api.get_report_data(
             'campaigns',
             ['campaignId', 'impressions', 'clicks', 'cost', 
              'attributedSales14d', 'attributedConversions14d']
         )
-        
-        if not report_id:
-            logger.error("Failed to create campaign report")
+        if report_data is None:
             return results
         
-        report_url = self.api.wait_for_report(report_id)
-        if not report_url:
-            return results
-        
-        report_data = self.api.download_report(report_url)
-        
         # Get current campaigns
         campaigns = self.api.get_campaigns()
         campaign_map = {c.campaign_id: c for c in campaigns}
@@ -1037,11 +1399,10 @@ class CampaignManager:
         
         for row in report_data:
             campaign_id = row.get('campaignId')
-            if not campaign_id or campaign_id not in campaign_map:
+            campaign = campaign_map.get(campaign_id)
+            if campaign is None:
                 continue
             
-            campaign = campaign_map[campaign_id]
-            
             # Calculate metrics
             cost = float(row.get('cost', 0) or 0)
             sales = float(row.get('attributedSales14d', 0) or 0)
@@ -1062,8 +1423,9 @@ class CampaignManager:
                     campaign_id,
                     campaign.state,
                     'enabled',
-                    f"ACOS {acos:.1%} below threshold {acos_threshold:.1%}",
-                    dry_run
+                    "ACOS {:.1%} below threshold {:.1%}",
+                    dry_run,
+                    reason_args=(acos, acos_threshold)
                 )
                 
                 if not dry_run:
@@ -1079,8 +1441,9 @@ class CampaignManager:
                     campaign_id,
                     campaign.state,
                     'paused',
-                    f"ACOS {acos:.1%} above threshold {acos_threshold:.1%}",
-                    dry_run
+                    "ACOS {:.1%} above threshold {:.1%}",
+                    dry_run,
+                    reason_args=(acos, acos_threshold)
                 )
                 
                 if not dry_run:
@@ -1094,6 +1457,43 @@ class CampaignManager:
         return results
 
 
+def fetch_search_terms(api: AmazonAdsAPI) -> Optional[List[SearchTerm]]:
+    """Fetch the search-term report and decode its rows in a single pass
+    
+    Keyword discovery and negative keyword management both work from this
+    report; when both run, PPCAutomation fetches it once and shares it.
+    Returns None if the report could not be produced.
+    """
+    report_data = api.get_report_data(
+        'targets',
+        ['campaignId', 'adGroupId', 'query', 'impressions', 'clicks', 
+         'cost', 'attributedSales14d', 'attributedConversions14d'],
+        segment='query'
+    )
+    if report_data is None:
+        return None
+    
+    search_terms = []
+    for row in report_data:
+        query = row.get('query', '').strip().lower()
+        if not query:
+            continue
+        
+        cost = float(row.get('cost', 0) or 0)
+        sales = float(row.get('attributedSales14d', 0) or 0)
+        search_terms.append(SearchTerm(
+            query=query,
+            campaign_id=row.get('campaignId'),
+            ad_group_id=row.get('adGroupId'),
+            clicks=int(row.get('clicks', 0) or 0),
+            cost=cost,
+            sales=sales,
+            acos=(cost / sales) if sales > 0 else float('inf')
+        ))
+    
+    return search_terms
+
+
 class KeywordDiscovery:
     """Discover and add new keywords"""
     
@@ -1102,8 +1502,12 @@ class KeywordDiscovery:
         self.api = api
         self.audit = audit_logger
     
-    def discover_keywords(self, dry_run: bool = False) -> Dict:
-        """Discover and add new keywords"""
+    def discover_keywords(self, dry_run: bool = False,
+                          search_terms: Optional[List[SearchTerm]] = None) -> Dict:
+        """Discover and add new keywords
+        
+        search_terms may be passed in when the report was already fetched.
+        """
         logger.info("=== Discovering Keywords ===")
         
         results = {
@@ -1112,68 +1516,48 @@ class KeywordDiscovery:
         }
         
         # Get search term report to find high-performing queries
-        report_id = self.api.create_report(
-            'targets',
-            ['campaignId', 'adGroupId', 'query', 'impressions', 'clicks', 
-             'cost', 'attributedSales14d', 'attributedConversions14d'],
-            segment='query'
-        )
-        
-        if not report_id:
-            logger.error("Failed to create search term report")
-            return results
-        
-        report_url = self.api.wait_for_report(report_id)
-        if not report_url:
-            return results
-        
-        report_data = self.api.download_report(report_url)
-        
-        # Get existing keywords to avoid duplicates
+        if search_terms is None:
+            search_terms = fetch_search_terms(self.api)
+            if search_terms is None:
+                return results
+        
+        # Get existing keywords to avoid duplicates. Discovery only adds exact
+        # match, so only exact-match keywords need indexing (the v3 API
+        # reports match types in upper case).
         existing_keywords = self.api.get_keywords()
         existing_keyword_texts = {
-            (kw.ad_group_id, kw.keyword_text.lower(), kw.match_type) 
+            (kw.ad_group_id, kw.keyword_text.lower())
             for kw in existing_keywords
+            if kw.match_type.lower() == 'exact'
         }
         
         # Analyze search terms
         min_clicks = self.config.get('keyword_discovery.min_clicks', 5)
         max_acos = self.config.get('keyword_discovery.max_acos', 0.40)
+        suggested_bid = self.config.get('keyword_discovery.initial_bid', 0.75)
         
         new_keywords_to_add = []
         
-        for row in report_data:
-            query = row.get('query', '').strip().lower()
-            ad_group_id = row.get('adGroupId')
-            campaign_id = row.get('campaignId')
+        for term in search_terms:
+            query = term.query
+            ad_group_id = term.ad_group_id
             
-            if not query or not ad_group_id:
+            if not ad_group_id:
                 continue
             
-            # Calculate metrics
-            clicks = int(row.get('clicks', 0) or 0)
-            cost = float(row.get('cost', 0) or 0)
-            sales = float(row.get('attributedSales14d', 0) or 0)
-            
-            if clicks < min_clicks:
-                continue
-            
-            acos = (cost / sales) if sales > 0 else float('inf')
-            
-            if acos > max_acos:
+            if term.clicks < min_clicks or term.acos > max_acos:
                 continue
             
-            # Check if already exists
-            if (ad_group_id, query, 'exact') in existing_keyword_texts:
+            # Check if already exists (or already queued from an earlier row)
+            if (ad_group_id, query) in existing_keyword_texts:
                 continue
+            existing_keyword_texts.add((ad_group_id, query))
             
             results['keywords_discovered'] += 1
             
             # Prepare keyword for addition
-            suggested_bid = self.config.get('keyword_discovery.initial_bid', 0.75)
-            
             new_keywords_to_add.append({
-                'campaignId': int(campaign_id),
+                'campaignId': int(term.campaign_id),
                 'adGroupId': int(ad_group_id),
                 'keywordText': query,
                 'matchType': 'exact',
@@ -1187,17 +1571,15 @@ class KeywordDiscovery:
                 'NEW',
                 '',
                 query,
-                f"Added from search term: {clicks} clicks, ACOS {acos:.1%}",
-                dry_run
+                "Added from search term: {} clicks, ACOS {:.1%}",
+                dry_run,
+                reason_args=(term.clicks, term.acos)
             )
         
-        # Add keywords in batches
+        # Add keywords (batched by the API client)
         if new_keywords_to_add and not dry_run:
-            batch_size = 100
-            for i in range(0, len(new_keywords_to_add), batch_size):
-                batch = new_keywords_to_add[i:i+batch_size]
-                created_ids = self.api.create_keywords(batch)
-                results['keywords_added'] += len(created_ids)
+            created_ids = self.api.create_keywords(new_keywords_to_add)
+            results['keywords_added'] += len(created_ids)
         elif dry_run:
             results['keywords_added'] = len(new_keywords_to_add)
         
@@ -1213,8 +1595,12 @@ class NegativeKeywordManager:
         self.api = api
         self.audit = audit_logger
     
-    def add_negative_keywords(self, dry_run: bool = False) -> Dict:
-        """Add poor-performing keywords as negatives"""
+    def add_negative_keywords(self, dry_run: bool = False,
+                              search_terms: Optional[List[SearchTerm]] = None) -> Dict:
+        """Add poor-performing keywords as negatives
+        
+        search_terms may be passed in when the report was already fetched.
+        """
         logger.info("=== Managing Negative Keywords ===")
         
         results = {
@@ -1222,21 +1608,10 @@ class NegativeKeywordManager:
         }
         
         # Get search term report
-        report_id = self.api.create_report(
-            'targets',
-            ['campaignId', 'adGroupId', 'query', 'impressions', 'clicks', 
-             'cost', 'attributedSales14d', 'attributedConversions14d'],
-            segment='query'
-        )
-        
-        if not report_id:
-            return results
-        
-        report_url = self.api.wait_for_report(report_id)
-        if not report_url:
-            return results
-        
-        report_data = self.api.download_report(report_url)
+        if search_terms is None:
+            search_terms = fetch_search_terms(self.api)
+            if search_terms is None:
+                return results
         
         # Get existing negative keywords
         existing_negatives = self.api.get_negative_keywords()
@@ -1251,27 +1626,20 @@ class NegativeKeywordManager:
         
         negatives_to_add = []
         
-        for row in report_data:
-            query = row.get('query', '').strip().lower()
-            campaign_id = row.get('campaignId')
+        for term in search_terms:
+            query = term.query
+            campaign_id = term.campaign_id
             
-            if not query or not campaign_id:
+            if not campaign_id:
                 continue
             
-            cost = float(row.get('cost', 0) or 0)
-            sales = float(row.get('attributedSales14d', 0) or 0)
-            
-            if cost < min_spend:
+            if term.cost < min_spend or term.acos < max_acos:
                 continue
             
-            acos = (cost / sales) if sales > 0 else float('inf')
-            
-            if acos < max_acos:
-                continue
-            
-            # Check if already negative
+            # Check if already negative (or already queued from an earlier row)
             if (campaign_id, query) in existing_negative_texts:
                 continue
+            existing_negative_texts.add((campaign_id, query))
             
             negatives_to_add.append({
                 'campaignId': int(campaign_id),
@@ -1286,17 +1654,15 @@ class NegativeKeywordManager:
                 campaign_id,
                 '',
                 query,
-                f"Poor performer: ${cost:.2f} spend, ACOS {acos:.1%}",
-                dry_run
+                "Poor performer: ${:.2f} spend, ACOS {:.1%}",
+                dry_run,
+                reason_args=(term.cost, term.acos)
             )
         
-        # Add negative keywords
+        # Add negative keywords (batched by the API client)
         if negatives_to_add and not dry_run:
-            batch_size = 100
-            for i in range(0, len(negatives_to_add), batch_size):
-                batch = negatives_to_add[i:i+batch_size]
-                created_ids = self.api.create_negative_keywords(batch)
-                results['negative_keywords_added'] += len(created_ids)
+            created_ids = self.api.create_negative_keywords(negatives_to_add)
+            results['negative_keywords_added'] += len(created_ids)
         elif dry_run:
             results['negative_keywords_added'] = len(negatives_to_add)
         
@@ -1320,6 +1686,12 @@ class PPCAutomation:
         region = self.config.get('api.region', 'NA')
         self.api = AmazonAdsAPI(profile_id, region)
         
+        # Opt in to v3 reporting, which caches downloaded report rows on disk
+        # so repeated runs within the cache TTL skip the report round trip
+        if self.config.get('reporting.use_v3', False):
+            from amazon_ppc_optimizer_v2 import patch_api_client
+            patch_api_client(self.api, cache_dir=self.config.get('reporting.cache_dir', 'cache'))
+        
         # Initialize audit logger
         self.audit = AuditLogger()
         
@@ -1358,11 +1730,18 @@ class PPCAutomation:
             if 'campaign_management' in features:
                 results['campaign_management'] = self.campaign_manager.manage_campaigns(self.dry_run)
             
+            # Both search-term features share one report download
+            search_terms = None
+            if 'keyword_discovery' in features and 'negative_keywords' in features:
+                search_terms = fetch_search_terms(self.api) or []
+            
             if 'keyword_discovery' in features:
-                results['keyword_discovery'] = self.keyword_discovery.discover_keywords(self.dry_run)
+                results['keyword_discovery'] = self.keyword_discovery.discover_keywords(
+                    self.dry_run, search_terms)
             
             if 'negative_keywords' in features:
-                results['negative_keywords'] = self.negative_keywords.add_negative_keywords(self.dry_run)
+                results['negative_keywords'] = self.negative_keywords.add_negative_keywords(
+                    self.dry_run, search_terms)
             
         except Exception as e:
             logger.error(f"Automation failed: {e}")
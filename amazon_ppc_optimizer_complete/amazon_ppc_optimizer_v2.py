@@ -10,10 +10,14 @@ https://advertising.amazon.com/API/docs/en-us/reporting/v3/overview
 """
 
 import csv
-import gzip
+import hashlib
 import io
 import json
 import logging
+import os
+import random
+import sqlite3
+import threading
 import time
 import zipfile
 from datetime import datetime, timedelta
@@ -21,8 +25,15 @@ from typing import Dict, List, Optional
 
 import requests
 
+# Share the optional orjson/ISA-L shims with the client this module patches
+from amazon_ppc_optimizer import GZIP_MAGIC, gzip_mod, json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
+# How long downloaded report rows stay valid in the on-disk cache. Amazon
+# keeps restating attributed sales for recent days, so keep this short.
+REPORT_CACHE_TTL = 3600
+
 # ============================================================================
 # V3 REPORT TYPE MAPPINGS
 # Maps v2 report type names → v3 reportTypeId
@@ -89,9 +100,75 @@ def _translate_metrics_to_v3(metrics: List[str]) -> List[str]:
     return [V2_TO_V3_COLUMNS.get(m, m) for m in metrics]
 
 
+# ID columns: v3 GZIP_JSON reports carry them as numbers, but the optimizer
+# keys its campaign/ad group/keyword lookups on the string IDs the API returns
+ID_COLUMNS = frozenset({"campaignId", "adGroupId", "keywordId"})
+
+
 def _normalise_row_to_v2(row: Dict) -> Dict:
-    """Rename v3 column names back to v2 names so callers need no changes."""
-    return {V3_TO_V2_COLUMNS.get(k, k): v for k, v in row.items()}
+    """Rename v3 column names back to v2 names (and IDs back to strings)
+    so callers need no changes."""
+    return {
+        V3_TO_V2_COLUMNS.get(k, k): str(v) if k in ID_COLUMNS and v is not None else v
+        for k, v in row.items()
+    }
+
+
+# ============================================================================
+# PERSISTENT REPORT CACHE
+# ============================================================================
+
+class ReportCache:
+    """
+    On-disk cache of downloaded report rows, shared across runs.
+
+    Backed by SQLite so it needs no extra dependency. Implements the
+    get(name, **params) / set(name, value, **params) interface that
+    get_report_data_v3 calls; rows are stored as JSON.
+    """
+
+    def __init__(self, path: str = os.path.join("cache", "reports.sqlite3"),
+                 ttl: int = REPORT_CACHE_TTL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports "
+            "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self.clear_expired()
+
+    @staticmethod
+    def _key(name: str, **params) -> str:
+        """Canonical key: name plus a short hash of the sorted parameters."""
+        digest = hashlib.blake2b(
+            json.dumps(params, sort_keys=True, default=list).encode("utf-8"),
+            digest_size=12,
+        ).hexdigest()
+        return f"{name}:{digest}"
+
+    def get(self, name: str, **params) -> Optional[List[Dict]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM reports WHERE key = ? AND expires > ?",
+                (self._key(name, **params), time.time()),
+            ).fetchone()
+        return json_loads(row[0]) if row else None
+
+    def set(self, name: str, value: List[Dict], **params) -> None:
+        blob = json_dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (key, expires, value) VALUES (?, ?, ?)",
+                (self._key(name, **params), time.time() + self.ttl, blob),
+            )
+
+    def clear_expired(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reports WHERE expires <= ?", (time.time(),))
 
 
 # ============================================================================
@@ -170,7 +247,7 @@ class ReportingV3:
         try:
             logger.info(f"Creating v3 report: {report_type_id} for {report_date}")
             response = self._request("POST", self.REPORTING_BASE, json=payload)
-            data = response.json()
+            data = json_loads(response.content)
             report_id = data.get("reportId")
             logger.info(f"v3 report created: {report_id}")
             return report_id
@@ -182,7 +259,7 @@ class ReportingV3:
         """Poll v3 report status."""
         try:
             response = self._request("GET", f"{self.REPORTING_BASE}/{report_id}")
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
             logger.error(f"Failed to get v3 report status: {e}")
             return {}
@@ -191,19 +268,24 @@ class ReportingV3:
         self,
         report_id: str,
         timeout: int = 600,
-        poll_interval: int = 10,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 60.0,
     ) -> Optional[str]:
         """
         Poll until report is COMPLETED or timeout.
 
+        The delay between polls starts at poll_interval and doubles up to
+        max_poll_interval, with +/-20% jitter.
+
         Returns the download URL, or None.
         """
-        start = time.time()
+        start = time.monotonic()
         poll = 0
+        wait = poll_interval / 2
 
         logger.info(f"Waiting for v3 report {report_id} (timeout {timeout}s)...")
 
-        while time.time() - start < timeout:
+        while time.monotonic() - start < timeout:
             poll += 1
             data = self.get_report_status_v3(report_id)
             status = data.get("status", "UNKNOWN")
@@ -212,7 +294,7 @@ class ReportingV3:
 
             if status == "COMPLETED":
                 url = data.get("url")
-                logger.info(f"Report ready in {time.time()-start:.0f}s → {url}")
+                logger.info(f"Report ready in {time.monotonic()-start:.0f}s → {url}")
                 return url
 
             if status in ("FAILED", "CANCELLED"):
@@ -220,7 +302,11 @@ class ReportingV3:
                 logger.error(f"  Details: {data.get('statusDetails', '')}")
                 return None
 
-            time.sleep(poll_interval)
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            wait = min(wait * 2, max_poll_interval)
+            time.sleep(min(wait * random.uniform(0.8, 1.2), remaining))
 
         logger.error(f"Report {report_id} timed out after {timeout}s")
         return None
@@ -232,28 +318,27 @@ class ReportingV3:
         """
         try:
             logger.info("Downloading v3 report...")
-            resp = requests.get(url, timeout=120)
+            # Reuse the client's pooled session when patched onto AmazonAdsAPI
+            session = getattr(self, "session", None) or requests
+            resp = session.get(url, timeout=120)
             resp.raise_for_status()
 
             content = resp.content
 
-            # v3 default format is GZIP_JSON
-            try:
-                with gzip.GzipFile(fileobj=io.BytesIO(content)) as gz:
-                    raw = gz.read().decode("utf-8")
-            except OSError:
-                # Fallback: maybe plain JSON or CSV
-                raw = content.decode("utf-8")
-
-            # Parse JSON array
-            try:
-                rows = json.loads(raw)
+            # v3 default format is GZIP_JSON; anything else is plain JSON or CSV
+            if content[:2] == GZIP_MAGIC:
+                raw = gzip_mod.decompress(content)
+            else:
+                raw = content
+
+            # A JSON body starts with an array or object; otherwise it is CSV
+            if raw[:64].lstrip()[:1] in (b"[", b"{"):
+                rows = json_loads(raw)
                 if not isinstance(rows, list):
                     # Some responses wrap in {"reports": [...]}
                     rows = rows.get("reports", rows.get("data", []))
-            except json.JSONDecodeError:
-                # Fallback: try CSV
-                reader = csv.DictReader(io.StringIO(raw))
+            else:
+                reader = csv.DictReader(io.StringIO(raw.decode("utf-8")))
                 rows = list(reader)
 
             # Normalise column names back to v2 equivalents
@@ -273,13 +358,18 @@ class ReportingV3:
         report_date: str = None,
         segment: str = None,
         use_cache: bool = True,
-    ) -> List[Dict]:
+    ) -> Optional[List[Dict]]:
         """
         Main entry point – replaces get_report_data() completely.
 
         Creates a v3 report, waits for it, downloads it, and returns rows
-        with v2-compatible column names. Caches identically to v2.
+        with v2-compatible column names, or None if the report could not be
+        produced. Caches identically to v2.
         """
+        # Pin the default date so a cached "yesterday" is not reused tomorrow
+        if report_date is None:
+            report_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
         # Check cache (same key scheme as v2 so existing cache hits still work)
         if use_cache and getattr(self, "cache_enabled", False):
             cached = self.cache.get(
@@ -294,11 +384,11 @@ class ReportingV3:
 
         report_id = self.create_report_v3(report_type, metrics, report_date, segment)
         if not report_id:
-            return []
+            return None
 
         url = self.wait_for_report_v3(report_id)
         if not url:
-            return []
+            return None
 
         data = self.download_report_v3(url)
 
@@ -335,7 +425,7 @@ class ReportingV3:
 # PATCH FUNCTION  –  call this after creating AmazonAdsAPI
 # ============================================================================
 
-def patch_api_client(api_instance) -> None:
+def patch_api_client(api_instance, cache_dir: Optional[str] = "cache") -> None:
     """
     Monkey-patch a v2 AmazonAdsAPI instance so all reporting calls use v3.
 
@@ -346,6 +436,8 @@ def patch_api_client(api_instance) -> None:
 
     This binds all ReportingV3 methods onto the instance and then replaces
     the four public reporting methods with their v3 equivalents.
+    get_report_data reuses report rows stored in cache_dir by earlier runs
+    (see ReportCache); pass cache_dir=None to always download.
     """
     import types
 
@@ -371,4 +463,8 @@ def patch_api_client(api_instance) -> None:
     api_instance.download_report = types.MethodType(ReportingV3.download_report_v3, api_instance)
     api_instance.get_report_data = types.MethodType(ReportingV3.get_report_data_v3, api_instance)
 
+    if cache_dir:
+        api_instance.cache = ReportCache(os.path.join(cache_dir, "reports.sqlite3"))
+        api_instance.cache_enabled = True
+
     logger.info("AmazonAdsAPI patched: reporting v2 → v3")
@@ -1,20 +1,124 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
 from amazon_ppc_optimizer import PPCOptimizer
 from datetime import datetime
-from time import time
+from time import sleep, time
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+# Optional: orjson serializes straight to bytes, much faster than jsonify
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Optional: share the cache between gunicorn workers through Redis
+try:
+    import redis
+except ImportError:
+    redis = None
 
 app = Flask(__name__)
 CORS(app)
 
-# Simple in-memory cache
-_CACHE = {'payload': None, 'ts': 0}
+# Simple in-memory cache: a (body, etag, ts) tuple of the serialized payload,
+# its ETag and when it was built. Replaced in one assignment and read once per
+# request, so a body is never served under another payload's ETag.
+_CACHE = None
 CACHE_TTL = 60  # seconds
+CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=30'
+
+REDIS_URL = os.environ.get('REDIS_URL')
+_REDIS_KEY = 'ppc:api_metrics'
+_REDIS = redis.Redis.from_url(REDIS_URL) if redis and REDIS_URL else None
+
+# Single flight: one thread per worker fetches, and one worker at a time
+# across the deployment through a Redis claim
+_FETCH_LOCK = threading.Lock()
+_LOCK_KEY = 'ppc:api_metrics:lock'
+_LOCK_TTL = 300  # seconds; outlasts a slow summary fetch
+_LOCK_POLL = 0.5  # seconds between checks while another worker fetches
+# Compare-and-delete, so a worker only ever releases its own claim
+_RELEASE = _REDIS.register_script(
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) end return 0"
+) if _REDIS is not None else None
+
+
+def _shared_get():
+    """Return (body, etag, ts) cached by any worker, or None"""
+    if _REDIS is None:
+        return None
+    try:
+        entry = _REDIS.hgetall(_REDIS_KEY)
+    except redis.RedisError:
+        return None
+    if not entry:
+        return None
+    return entry[b'body'], entry[b'etag'].decode(), float(entry[b'ts'])
+
+
+def _shared_set(body, etag, ts):
+    if _REDIS is None:
+        return
+    try:
+        pipe = _REDIS.pipeline()
+        pipe.hset(_REDIS_KEY, mapping={'body': body, 'etag': etag, 'ts': ts})
+        pipe.expire(_REDIS_KEY, CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+def _claim():
+    """Claim the fetch across workers; a token if ours (or no Redis), else None"""
+    token = uuid.uuid4().hex
+    if _REDIS is None:
+        return token
+    try:
+        return token if _REDIS.set(_LOCK_KEY, token, nx=True, ex=_LOCK_TTL) else None
+    except redis.RedisError:
+        return token
+
+
+def _release(token):
+    if _REDIS is None:
+        return
+    try:
+        _RELEASE(keys=[_LOCK_KEY], args=[token])
+    except redis.RedisError:
+        pass
+
+
+def json_response(obj, status=200):
+    return Response(_dumps(obj), status=status, mimetype='application/json')
+
+
+def _cached_response(entry):
+    """Serve a cached body, or 304 if the client already has this version"""
+    body, etag, _ = entry
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+_HEALTH_BODY = _dumps({'status': 'ok'})
 
 
 @app.route('/health')
 def health():
-    return jsonify({'status': 'ok'})
+    return Response(_HEALTH_BODY, mimetype='application/json')
 
 
 @app.route('/api/metrics')
@@ -30,32 +134,71 @@ def api_metrics():
     """
     try:
         # Return cached payload when fresh
-        if _CACHE['payload'] and (time() - _CACHE['ts'] < CACHE_TTL):
-            return jsonify(_CACHE['payload'])
-
-        optimizer = PPCOptimizer(config_path='config.json')
-        summary = optimizer.get_summary_metrics()
-
-        # campaigns: minimal placeholder list; later can be enriched
-        campaigns = []
-        if isinstance(summary, dict):
-            # produce a simple campaigns array if present
-            campaigns = [
-                { 'name': 'Campaign A', 'acos': 32.5 },
-                { 'name': 'Campaign B', 'acos': 41.2 }
-            ]
-
-        payload = {
-            'summary': summary,
-            'campaigns': campaigns,
-            'last_updated': datetime.utcnow().isoformat() + 'Z'
-        }
-        _CACHE['payload'] = payload
-        _CACHE['ts'] = time()
-        return jsonify(payload)
+        entry = _CACHE
+        if entry and (time() - entry[2] < CACHE_TTL):
+            return _cached_response(entry)
+
+        return _cached_response(_refresh())
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+def _refresh():
+    """Return a fresh cache entry, building it once across threads and workers"""
+    global _CACHE
+    with _FETCH_LOCK:
+        # A thread that held the lock before us may have just refreshed
+        entry = _CACHE
+        if entry and (time() - entry[2] < CACHE_TTL):
+            return entry
+
+        # Adopt another worker's payload, or wait while one is being built.
+        # The claim is released if that build fails and expires if it hangs.
+        token = _claim()
+        while True:
+            shared = _shared_get()
+            if shared:
+                if token:
+                    _release(token)
+                _CACHE = shared
+                return shared
+            if token:
+                break
+            sleep(_LOCK_POLL)
+            token = _claim()
+
+        try:
+            entry = _build_entry()
+            _CACHE = entry
+            _shared_set(*entry)
+            return entry
+        finally:
+            _release(token)
+
+
+def _build_entry():
+    """Fetch the summary and return a (body, etag, ts) cache entry"""
+    optimizer = PPCOptimizer(config_path='config.json')
+    summary = optimizer.get_summary_metrics()
+
+    # campaigns: minimal placeholder list; later can be enriched
+    campaigns = []
+    if isinstance(summary, dict):
+        # produce a simple campaigns array if present
+        campaigns = [
+            { 'name': 'Campaign A', 'acos': 32.5 },
+            { 'name': 'Campaign B', 'acos': 41.2 }
+        ]
+
+    payload = {
+        'summary': summary,
+        'campaigns': campaigns,
+        'last_updated': datetime.utcnow().isoformat() + 'Z'
+    }
+    body = _dumps(payload)
+    return (body, hashlib.blake2b(body, digest_size=16).hexdigest(), time())
 
 
 if __name__ == '__main__':
+    # Local development only; the Dockerfile serves this app with gunicorn
     app.run(host='0.0.0.0', port=8080)
@@ -6,54 +6,267 @@ Provides REST endpoints for dashboard and metrics
 
 import os
 import json
+import hashlib
 import logging
+from dataclasses import asdict
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
+from typing import NamedTuple
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
 import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the optimizer
 from amazon_ppc_optimizer import BidOptimizer, AmazonAdsAPI
 
+# Optional: orjson serializes responses (dataclasses included) straight to
+# bytes, several times faster than jsonify's stdlib json
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), default=asdict).encode('utf-8')
+
+# Optional: share the metrics cache between workers/restarts through Redis
+try:
+    import redis
+except ImportError:
+    redis = None
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for dashboard access
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global state for caching metrics
+
+class MetricsSnapshot(NamedTuple):
+    """Serialized metrics with their ETag and fetch time"""
+    body: bytes
+    etag: str
+    fetched_at: float   # time.monotonic(), for cheap age checks
+    last_updated: str   # ISO timestamp, for display
+
+
+# Global state for caching metrics. The snapshot is replaced in a single
+# assignment, so request threads never see a body paired with another
+# refresh's etag or timestamp.
 metrics_cache = {
-    'last_updated': None,
-    'data': {},
+    'snapshot': None,
     'optimizer_running': False
 }
 
 CACHE_DURATION = 300  # 5 minutes
+STALE_GRACE = 600  # serve stale metrics this long past expiry while refreshing
+CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=60'
 
+# Held while a background refresh is in flight
+refresh_lock = threading.Lock()
 
-def get_api_client():
-    """Initialize Amazon Ads API client from environment variables"""
+# Serializes upstream fetches so concurrent cache misses share one call
+fetch_lock = threading.Lock()
+
+# Amazon Ads credentials, read once at startup
+CLIENT_ID = os.environ.get('CLIENT_ID')
+CLIENT_SECRET = os.environ.get('CLIENT_SECRET')
+REFRESH_TOKEN = os.environ.get('REFRESH_TOKEN')
+PROFILE_ID = os.environ.get('PROFILE_ID', '1780498399290938')
+HAVE_CREDENTIALS = all([CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN])
+if not HAVE_CREDENTIALS:
+    logger.error("Missing required credentials (CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN); "
+                 "Amazon Ads endpoints will be unavailable")
+
+# Shared Amazon Ads client, built on first use (see get_api_client)
+api_client = None
+api_client_lock = threading.Lock()
+
+# Optimization runs are exclusive, so one long-lived worker thread suffices
+optimizer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='optimizer')
+optimizer_lock = threading.Lock()  # guards the optimizer_running check-and-set
+
+# Runs the campaigns report alongside the campaign list in fetch_metrics;
+# fetches are single-flight, so one thread is enough
+report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+
+REDIS_URL = os.environ.get('REDIS_URL')
+METRICS_KEY = 'ppc:metrics'
+FETCH_LOCK_KEY = 'ppc:metrics:lock'
+# Must outlast a slow fetch: token refresh (30s), get_campaigns with retries
+# (~2 min), then the report wait (300s) and download (120s)
+FETCH_LOCK_TTL = 660
+FETCH_POLL_INTERVAL = 0.5  # seconds between checks while another worker fetches
+shared_cache = redis.Redis.from_url(REDIS_URL) if redis and REDIS_URL else None
+
+# Delete the fetch claim only if it still holds our token, so a fetch that
+# outlived its claim cannot release another worker's
+release_fetch_claim = shared_cache.register_script(
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) end return 0"
+) if shared_cache is not None else None
+
+
+def load_shared_metrics():
+    """Return (body, etag, fetched_at) from Redis, or None if absent/unavailable"""
+    if shared_cache is None:
+        return None
     try:
-        client_id = os.environ.get('CLIENT_ID')
-        client_secret = os.environ.get('CLIENT_SECRET')
-        refresh_token = os.environ.get('REFRESH_TOKEN')
-        profile_id = os.environ.get('PROFILE_ID', '1780498399290938')
-        
-        if not all([client_id, client_secret, refresh_token]):
-            raise ValueError("Missing required credentials")
-        
-        api = AmazonAdsAPI(
-            client_id=client_id,
-            client_secret=client_secret,
-            refresh_token=refresh_token,
-            region='NA'
-        )
-        api.profile_id = profile_id
-        return api
-    except Exception as e:
-        logger.error(f"Failed to initialize API client: {e}")
+        entry = shared_cache.hgetall(METRICS_KEY)
+    except redis.RedisError as e:
+        logger.warning("Redis read failed: %s", e)
+        return None
+    if not entry:
+        return None
+    # Redis holds wall-clock time; map it onto this process's monotonic clock
+    fetched_at = float(entry[b'fetched_at'])
+    age = time.time() - fetched_at
+    return MetricsSnapshot(entry[b'body'], entry[b'etag'].decode(),
+                           time.monotonic() - age,
+                           datetime.fromtimestamp(fetched_at).isoformat())
+
+
+def store_shared_metrics(snapshot):
+    """Publish metrics to Redis for the other workers, expiring with the cache"""
+    if shared_cache is None:
+        return
+    try:
+        pipe = shared_cache.pipeline()
+        pipe.hset(METRICS_KEY, mapping={
+            'body': snapshot.body, 'etag': snapshot.etag,
+            'fetched_at': time.time() - (time.monotonic() - snapshot.fetched_at)
+        })
+        pipe.expire(METRICS_KEY, CACHE_DURATION)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Redis write failed: %s", e)
+
+
+def claim_shared_fetch():
+    """Claim the right to fetch metrics across workers (SET NX with a token)
+    
+    Returns a token when this worker should fetch: it won the claim, or there
+    is no Redis to coordinate through. Returns None while another worker
+    holds the claim.
+    """
+    token = uuid.uuid4().hex
+    if shared_cache is None:
+        return token
+    try:
+        if shared_cache.set(FETCH_LOCK_KEY, token, nx=True, ex=FETCH_LOCK_TTL):
+            return token
         return None
+    except redis.RedisError as e:
+        logger.warning("Redis lock failed: %s", e)
+        return token
+
+
+def release_shared_fetch(token):
+    """Drop the cross-worker fetch claim if it is still ours"""
+    if shared_cache is None:
+        return
+    try:
+        release_fetch_claim(keys=[FETCH_LOCK_KEY], args=[token])
+    except redis.RedisError as e:
+        logger.warning("Redis unlock failed: %s", e)
+
+
+def set_metrics_cache(metrics):
+    """Serialize freshly fetched metrics and store them locally and shared"""
+    body = dumps(metrics)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    snapshot = MetricsSnapshot(body, etag, time.monotonic(), datetime.now().isoformat())
+    metrics_cache['snapshot'] = snapshot
+    store_shared_metrics(snapshot)
+    return snapshot
+
+
+def json_response(obj, status=200):
+    """JSON response serialized with dumps()"""
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+
+def cached_json_response(snapshot):
+    """Serve pre-serialized JSON, or 304 if the client already has this version"""
+    if snapshot.etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def get_api_client():
+    """Return the shared Amazon Ads API client, initializing it on first use
+    
+    The client is reused across requests so its pooled HTTPS connections and
+    OAuth token (refreshed shortly before expiry) carry over between calls.
+    """
+    global api_client
+    if api_client is not None or not HAVE_CREDENTIALS:
+        return api_client
+    
+    with api_client_lock:
+        if api_client is not None:
+            return api_client
+        try:
+            # AmazonAdsAPI reads its credentials from the AMAZON_* variables
+            os.environ.setdefault('AMAZON_CLIENT_ID', CLIENT_ID)
+            os.environ.setdefault('AMAZON_CLIENT_SECRET', CLIENT_SECRET)
+            os.environ.setdefault('AMAZON_REFRESH_TOKEN', REFRESH_TOKEN)
+            
+            api_client = AmazonAdsAPI(PROFILE_ID, region='NA')
+        except (Exception, SystemExit) as e:
+            # AmazonAdsAPI exits on authentication failure; keep serving
+            logger.error("Failed to initialize API client: %s", e)
+            return None
+    
+    return api_client
+
+
+PERFORMANCE_FIELDS = ('total_spend', 'total_sales', 'acos', 'roas',
+                      'clicks', 'impressions', 'ctr')
+
+
+def fetch_campaign_report(api):
+    """Return campaign performance rows, or None if the report is unavailable"""
+    return api.get_report_data(
+        'campaigns',
+        ['campaignId', 'impressions', 'clicks', 'cost', 'attributedSales14d']
+    )
+
+
+def summarize_campaign_report(rows):
+    """Total campaign report rows in a single pass
+    
+    Without a report every figure is None, so clients can tell "no data"
+    apart from a day with no spend.
+    """
+    if rows is None:
+        return dict.fromkeys(PERFORMANCE_FIELDS)
+    
+    total_spend = total_sales = 0.0
+    total_clicks = total_impressions = 0
+    for row in rows:
+        total_spend += float(row.get('cost', 0) or 0)
+        total_sales += float(row.get('attributedSales14d', 0) or 0)
+        total_clicks += int(row.get('clicks', 0) or 0)
+        total_impressions += int(row.get('impressions', 0) or 0)
+    
+    # Raw figures; the dashboard formats them for display
+    return {
+        'total_spend': total_spend,
+        'total_sales': total_sales,
+        'acos': (total_spend / total_sales * 100) if total_sales > 0 else 0,
+        'roas': total_sales / total_spend if total_spend > 0 else 0,
+        'clicks': total_clicks,
+        'impressions': total_impressions,
+        'ctr': (total_clicks / total_impressions * 100) if total_impressions > 0 else 0,
+    }
 
 
 def fetch_metrics():
@@ -63,29 +276,16 @@ def fetch_metrics():
         if not api:
             return None
         
-        # Get campaigns
+        # Campaign objects only carry settings; performance comes from the
+        # campaigns report. The two calls are independent, so overlap them.
+        report_future = report_executor.submit(fetch_campaign_report, api)
         campaigns = api.get_campaigns()
-        
-        # Calculate metrics
-        total_spend = sum(c.get('cost', 0) for c in campaigns)
-        total_sales = sum(c.get('sales', 0) for c in campaigns)
-        total_clicks = sum(c.get('clicks', 0) for c in campaigns)
-        total_impressions = sum(c.get('impressions', 0) for c in campaigns)
-        
-        acos = (total_spend / total_sales * 100) if total_sales > 0 else 0
-        ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
-        
-        active_campaigns = len([c for c in campaigns if c.get('state') == 'ENABLED'])
+        active_campaigns = sum(1 for c in campaigns if c.state.lower() == 'enabled')
+        report = report_future.result()
         
         metrics = {
             'summary': {
-                'total_spend': round(total_spend, 2),
-                'total_sales': round(total_sales, 2),
-                'acos': round(acos, 2),
-                'roas': round(total_sales / total_spend, 2) if total_spend > 0 else 0,
-                'clicks': total_clicks,
-                'impressions': total_impressions,
-                'ctr': round(ctr, 4),
+                **summarize_campaign_report(report),
                 'active_campaigns': active_campaigns,
                 'total_campaigns': len(campaigns)
             },
@@ -96,54 +296,116 @@ def fetch_metrics():
         return metrics
         
     except Exception as e:
-        logger.error(f"Error fetching metrics: {e}")
+        logger.error("Error fetching metrics: %s", e)
         return None
 
 
-def update_metrics_cache():
-    """Background task to update metrics cache"""
-    global metrics_cache
+def adopt_shared_metrics(current):
+    """Cache and return the shared snapshot if it is newer than current"""
+    shared = load_shared_metrics()
+    if shared and (not current or shared.fetched_at > current.fetched_at):
+        metrics_cache['snapshot'] = shared
+        logger.info("Metrics cache updated from shared cache")
+        return shared
+    return None
+
+
+def refresh_metrics():
+    """Refresh the metrics cache with one upstream call across threads and workers
     
-    while True:
+    Returns the new snapshot, or None if the fetch failed.
+    """
+    with fetch_lock:
+        # A thread that held the lock before us may have just refreshed
+        current = metrics_cache['snapshot']
+        if current and time.monotonic() - current.fetched_at < CACHE_DURATION:
+            return current
+        
+        # Another worker may already have refreshed the shared copy
+        shared = adopt_shared_metrics(current)
+        if shared:
+            return shared
+        
+        # While another worker is fetching, wait for it to publish. Its claim
+        # is released if that fetch fails and expires if it hangs; either way
+        # one waiter takes over.
+        token = claim_shared_fetch()
+        while token is None:
+            time.sleep(FETCH_POLL_INTERVAL)
+            shared = adopt_shared_metrics(current)
+            if shared:
+                return shared
+            token = claim_shared_fetch()
+        
         try:
-            logger.info("Updating metrics cache...")
+            # The previous holder may have published just before releasing
+            shared = adopt_shared_metrics(current)
+            if shared:
+                return shared
             metrics = fetch_metrics()
-            
-            if metrics:
-                metrics_cache['data'] = metrics
-                metrics_cache['last_updated'] = datetime.now()
-                logger.info("Metrics cache updated successfully")
-            else:
-                logger.warning("Failed to fetch metrics")
-                
-        except Exception as e:
-            logger.error(f"Error updating cache: {e}")
+            return set_metrics_cache(metrics) if metrics else None
+        finally:
+            release_shared_fetch(token)
+
+
+def update_metrics_cache():
+    """Background refresh of the metrics cache; releases refresh_lock when done"""
+    try:
+        logger.info("Updating metrics cache...")
         
-        # Wait before next update
-        time.sleep(CACHE_DURATION)
+        if refresh_metrics():
+            logger.info("Metrics cache updated successfully")
+        else:
+            logger.warning("Failed to fetch metrics")
+            
+    except Exception as e:
+        logger.error("Error updating cache: %s", e)
+    finally:
+        refresh_lock.release()
+
+
+def start_background_refresh():
+    """Start a cache refresh unless one is already running"""
+    if refresh_lock.acquire(blocking=False):
+        threading.Thread(target=update_metrics_cache, daemon=True).start()
+
+
+# Liveness payload never changes, so it is serialized once
+INDEX_BODY = dumps({
+    'status': 'healthy',
+    'service': 'Amazon PPC Optimizer API',
+    'version': '1.0.0'
+})
+
+HEALTH_CHECK_TTL = 10  # seconds to reuse the API connection check
+api_health = {'ok': False, 'checked_at': None}
+
+
+def api_connection_ok():
+    """Whether the API client is available, re-checked at most every HEALTH_CHECK_TTL"""
+    now = time.monotonic()
+    if api_health['checked_at'] is None or now - api_health['checked_at'] >= HEALTH_CHECK_TTL:
+        api_health['ok'] = get_api_client() is not None
+        api_health['checked_at'] = now
+    return api_health['ok']
 
 
 @app.route('/')
 def index():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Amazon PPC Optimizer API',
-        'version': '1.0.0',
-        'timestamp': datetime.now().isoformat()
-    })
+    return Response(INDEX_BODY, mimetype='application/json')
 
 
 @app.route('/health')
 def health():
     """Detailed health check"""
-    api = get_api_client()
-    api_healthy = api is not None
+    api_healthy = api_connection_ok()
+    snapshot = metrics_cache['snapshot']
     
-    return jsonify({
+    return json_response({
         'status': 'healthy' if api_healthy else 'degraded',
         'api_connection': api_healthy,
-        'cache_age': (datetime.now() - metrics_cache['last_updated']).seconds if metrics_cache['last_updated'] else None,
+        'cache_age': int(time.monotonic() - snapshot.fetched_at) if snapshot else None,
         'optimizer_running': metrics_cache['optimizer_running']
     })
 
@@ -152,75 +414,96 @@ def health():
 def get_metrics():
     """Get current PPC metrics"""
     try:
-        # Check cache freshness
-        if metrics_cache['last_updated']:
-            age = (datetime.now() - metrics_cache['last_updated']).seconds
-            if age < CACHE_DURATION and metrics_cache['data']:
-                logger.info(f"Returning cached metrics (age: {age}s)")
-                return jsonify(metrics_cache['data'])
-        
-        # Fetch fresh metrics
+        # Check cache freshness against a single snapshot read
+        snapshot = metrics_cache['snapshot']
+        if snapshot:
+            age = time.monotonic() - snapshot.fetched_at
+            if age < CACHE_DURATION:
+                logger.debug("Returning cached metrics (age: %.0fs)", age)
+                return cached_json_response(snapshot)
+            
+            # Stale-while-revalidate: answer from cache, refresh behind the request
+            if age < CACHE_DURATION + STALE_GRACE:
+                logger.info("Returning stale metrics (age: %.0fs), refreshing", age)
+                start_background_refresh()
+                return cached_json_response(snapshot)
+        
+        # Cache miss: concurrent requests wait on a single fetch
         logger.info("Fetching fresh metrics...")
-        metrics = fetch_metrics()
+        fresh = refresh_metrics()
         
-        if metrics:
-            metrics_cache['data'] = metrics
-            metrics_cache['last_updated'] = datetime.now()
-            return jsonify(metrics)
+        if fresh:
+            return cached_json_response(fresh)
         else:
-            return jsonify({
+            return json_response({
                 'error': 'Failed to fetch metrics',
-                'last_cached': metrics_cache['last_updated'].isoformat() if metrics_cache['last_updated'] else None
-            }), 503
+                'last_cached': snapshot.last_updated if snapshot else None
+            }, 503)
             
     except Exception as e:
-        logger.error(f"Error in get_metrics: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error in get_metrics: %s", e)
+        return json_response({'error': str(e)}, 500)
+
+
+def optimize(dry_run):
+    """Background optimization run"""
+    try:
+        logger.info("Starting optimization (dry_run=%s)...", dry_run)
+        
+        # Here you would call the actual optimizer
+        # For now, just simulate
+        time.sleep(5)
+        
+        logger.info("Optimization completed")
+    except Exception as e:
+        logger.error("Optimization error: %s", e)
+    finally:
+        metrics_cache['optimizer_running'] = False
 
 
 @app.route('/api/optimize', methods=['POST'])
 def run_optimization():
     """Trigger optimization run"""
     try:
-        if metrics_cache['optimizer_running']:
-            return jsonify({
-                'status': 'already_running',
-                'message': 'Optimization is already in progress'
-            }), 409
-        
         # Get options from request
         data = request.json or {}
         dry_run = data.get('dry_run', False)
         
-        # Run optimization in background
-        def optimize():
-            global metrics_cache
-            try:
-                metrics_cache['optimizer_running'] = True
-                logger.info(f"Starting optimization (dry_run={dry_run})...")
-                
-                # Here you would call the actual optimizer
-                # For now, just simulate
-                time.sleep(5)
-                
-                logger.info("Optimization completed")
-            except Exception as e:
-                logger.error(f"Optimization error: {e}")
-            finally:
-                metrics_cache['optimizer_running'] = False
-        
-        thread = threading.Thread(target=optimize)
-        thread.start()
-        
-        return jsonify({
+        # Check-and-set under the lock so two requests cannot both start a
+        # run; mark it running before queuing so a second request cannot slip
+        # in ahead of the worker thread
+        with optimizer_lock:
+            if metrics_cache['optimizer_running']:
+                return json_response({
+                    'status': 'already_running',
+                    'message': 'Optimization is already in progress'
+                }, 409)
+            metrics_cache['optimizer_running'] = True
+        optimizer_executor.submit(optimize, dry_run)
+        
+        return json_response({
             'status': 'started',
             'dry_run': dry_run,
             'message': 'Optimization started in background'
         })
         
     except Exception as e:
-        logger.error(f"Error starting optimization: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error starting optimization: %s", e)
+        return json_response({'error': str(e)}, 500)
+
+
+CAMPAIGN_STREAM_CHUNK = 100  # campaigns serialized per response chunk
+
+
+def stream_campaigns(campaigns):
+    """Yield {"campaigns": [...], "count": n} as JSON, a chunk of campaigns at a time"""
+    yield b'{"campaigns":['
+    for start in range(0, len(campaigns), CAMPAIGN_STREAM_CHUNK):
+        chunk = campaigns[start:start + CAMPAIGN_STREAM_CHUNK]
+        if start:
+            yield b','
+        yield b','.join(dumps(c) for c in chunk)
+    yield b'],"count":%d}' % len(campaigns)
 
 
 @app.route('/api/campaigns')
@@ -229,23 +512,24 @@ def get_campaigns():
     try:
         api = get_api_client()
         if not api:
-            return jsonify({'error': 'API client not initialized'}), 503
+            return json_response({'error': 'API client not initialized'}, 503)
         
         campaigns = api.get_campaigns()
-        return jsonify({
-            'campaigns': campaigns,
-            'count': len(campaigns)
-        })
+        return Response(stream_with_context(stream_campaigns(campaigns)),
+                        mimetype='application/json')
         
     except Exception as e:
-        logger.error(f"Error fetching campaigns: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error fetching campaigns: %s", e)
+        return json_response({'error': str(e)}, 500)
 
 
 if __name__ == '__main__':
-    # Start background cache updater
-    cache_thread = threading.Thread(target=update_metrics_cache, daemon=True)
-    cache_thread.start()
+    # Local development only: the Werkzeug server is not built for production
+    # load. Production runs under gunicorn with threaded workers (see Procfile):
+    #   gunicorn api_server:app --worker-class gthread --workers 2 --threads 8
+    
+    # Warm the cache; later refreshes are driven by /api/metrics requests
+    start_background_refresh()
     
     # Start Flask app
     port = int(os.environ.get('PORT', 8080))